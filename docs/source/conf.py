@@ -34,14 +34,18 @@ autodoc_mock_imports = [
     "matplotlib.pyplot",
     "networkx",
     "numpy",
+    "orjson",
     "pandas",
     "pyproj",
     "requests",
     "scipy",
     "scipy.spatial",
     "shapely",
+    "shapely.errors",
     "shapely.geometry",
     "shapely.ops",
+    "shapely.prepared",
+    "shapely.strtree",
     "sklearn",
     "sklearn.neighbors",
 ]
@@ -18,6 +18,12 @@ from . import settings
 from . import utils
 from . import utils_geo
 
+# orjson is an optional dependency for faster parsing of large API responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def _get_osm_filter(network_type):
     """
@@ -97,6 +103,25 @@ def _get_osm_filter(network_type):
     return osm_filter
 
 
+def _json_loads(s):
+    """
+    Deserialize a JSON document, using orjson if it is installed.
+
+    Parameters
+    ----------
+    s : string or bytes
+        the JSON document to deserialize
+
+    Returns
+    -------
+    dict or list
+    """
+    if orjson is None:
+        return json.loads(s)
+    else:
+        return orjson.loads(s)
+
+
 def _save_to_cache(url, response_json):
     """
     Save an HTTP response json object to the cache.
@@ -189,7 +214,7 @@ def _get_from_cache(url, check_remark=False):
         cache_filepath = _url_in_cache(url)
         if cache_filepath is not None:
             with open(cache_filepath, encoding="utf-8") as cache_file:
-                response_json = json.load(cache_file)
+                response_json = _json_loads(cache_file.read())
 
                 # return None if check_remark is True and there is a server
                 # remark in the cached response
@@ -470,7 +495,7 @@ def nominatim_request(params, request_type="search", pause=1, error_pause=60):
         utils.log(f"Downloaded {size_kb:,.1f}KB from {domain}")
 
         try:
-            response_json = response.json()
+            response_json = _json_loads(response.content)
 
         except Exception:  # pragma: no cover
             sc = response.status_code
@@ -538,7 +563,7 @@ def overpass_request(data, pause=None, error_pause=60):
         utils.log(f"Downloaded {size_kb:,.1f}KB from {domain}")
 
         try:
-            response_json = response.json()
+            response_json = _json_loads(response.content)
             if "remark" in response_json:
                 utils.log(f'Server remark: "{response_json["remark"]}"', level=lg.WARNING)
 
@@ -1,11 +1,16 @@
 """Download and plot footprints from OpenStreetMap."""
 
+from collections import ChainMap
+
 import geopandas as gpd
-import numpy as np
+from shapely.errors import TopologicalError
 from shapely.geometry import LineString
 from shapely.geometry import MultiPolygon
 from shapely.geometry import Polygon
 from shapely.ops import polygonize
+from shapely.ops import unary_union
+from shapely.prepared import prep
+from shapely.strtree import STRtree
 
 from . import downloader
 from . import geocoder
@@ -89,53 +94,57 @@ def _create_footprints_gdf(
     if responses is None:
         responses = _osm_footprints_download(polygon, footprint_type)
 
-    # parse the list of responses into separate dicts of vertices, footprints and relations
-    # create a set of ways not directly tagged with footprint_type
-    vertices, footprints, relations, untagged_ways = _responses_to_dicts(responses, footprint_type)
-
-    # create simple Shapely geometries (Polygon or LineString) for all of the ways in footprints
-    for footprint_key, footprint_val in footprints.items():
-        footprint_val["geometry"] = _create_footprint_geometry(
-            footprint_key, footprint_val, vertices
-        )
+    # parse the list of responses into a list of vertex coordinates and
+    # separate dicts of footprints and relations. ways not directly tagged
+    # with footprint_type go in their own dict as they are only needed as
+    # relation members
+    node_id_to_idx, node_coords, footprints, relations, untagged_ways = _responses_to_dicts(
+        responses, footprint_type
+    )
 
-    # create a complex Shapely Polygon or MultiPolygon for each relation
+    # create simple Shapely geometries (Polygon or LineString) for all of the
+    # tagged and untagged ways
+    for ways in (footprints, untagged_ways):
+        for way_key, way_val in ways.items():
+            way_val["geometry"] = _create_footprint_geometry(
+                way_key, way_val, node_id_to_idx, node_coords
+            )
+
+    # create a complex Shapely Polygon or MultiPolygon for each relation,
+    # looking up its members among both the tagged and untagged ways
+    member_ways = ChainMap(footprints, untagged_ways)
     for relation_key, relation_val in relations.items():
-        relation_val["geometry"] = _create_relation_geometry(relation_key, relation_val, footprints)
+        relation_val["geometry"] = _create_relation_geometry(
+            relation_key, relation_val, member_ways
+        )
 
     # merge relations into the footprints dictionary
     footprints.update(relations)
 
-    # delete supporting geometry not directly tagged with footprint_type from the footprints dictionary
-    for untagged_way in untagged_ways:
-        try:
-            del footprints[untagged_way]
-        except KeyError:
-            utils.log(f"untagged_way {untagged_way} not found in footprints dict")
-
-    # Convert footprints dictionary to a GeoDataFrame
-    gdf = gpd.GeoDataFrame.from_dict(footprints, orient="index")
-    if "geometry" not in gdf.columns:
-        # if there is no geometry column, create a null column
-        gdf["geometry"] = np.nan
-    gdf.set_geometry("geometry")
-    gdf.crs = settings.default_crs
+    # convert footprints dictionary to a GeoDataFrame, passing the geometries
+    # in as their own list so pandas doesn't have to infer them row by row
+    geometry = [footprint.pop("geometry", None) for footprint in footprints.values()]
+    gdf = gpd.GeoDataFrame(
+        data=list(footprints.values()),
+        index=list(footprints.keys()),
+        geometry=geometry,
+        crs=settings.default_crs,
+    )
 
     # filter the gdf to only include valid Polygons/MultiPolygons if retain_invalid is False
     if not retain_invalid and not gdf.empty:
-        filter1 = gdf["geometry"].is_valid
-        filter2 = (gdf["geometry"].geom_type == "Polygon") | (
-            gdf["geometry"].geom_type == "MultiPolygon"
-        )
-        filter_combined = filter1 & filter2
-        gdf = gdf[filter_combined]
+        # build a single mask: check each geometry's type once, then check
+        # validity only for the Polygons/MultiPolygons, and filter in one pass
+        to_keep = gdf["geometry"].geom_type.isin({"Polygon", "MultiPolygon"}).values
+        to_keep[to_keep] = gdf["geometry"].iloc[to_keep].is_valid.values
+        gdf = gdf.iloc[to_keep]
 
     return gdf
 
 
 def _responses_to_dicts(responses, footprint_type):
     """
-    Parse list of json responses into dicts of vertices, footprints, relations.
+    Parse list of json responses into vertex coordinates, footprints, relations.
 
     Note: OSM's data model and the Overpass API will return open ways (lines)
     as part of a 'polygon' query. These may be fragments of the inner and
@@ -143,8 +152,9 @@ def _responses_to_dicts(responses, footprint_type):
     'polygon' type tags.
 
     Ways not directly tagged with the footprint type are added to the
-    untagged_ways set for removal from the footprints dictionary at the end of
-    the process.
+    untagged_ways dictionary rather than the footprints dictionary, so they
+    are available as relation members but never end up in the results.
+    Relations not directly tagged with the footprint type are skipped.
 
     Some inner ways of relations may be tagged with the footprint type in
     their own right e.g. landuse=meadow as an inner way in a landuse=forest
@@ -160,63 +170,71 @@ def _responses_to_dicts(responses, footprint_type):
 
     Returns
     -------
-    (vertices, footprints, relations, untagged_footprints) : tuple
-        vertices
-            dictionary of OSM nodes including their lat, lng coordinates
+    (node_id_to_idx, node_coords, footprints, relations, untagged_ways) : tuple
+        node_id_to_idx
+            dictionary mapping OSM node IDs to their position in node_coords
+        node_coords
+            list of OSM nodes' (lng, lat) coordinate tuples
         footprints
             dictionary of OSM ways including their nodes and tags
         relations
             dictionary of OSM relations including member ids and tags
-        untagged_footprints
-            set of ids for ways or relations not directly tagged with
-            footprint_type
+        untagged_ways
+            dictionary of OSM ways not directly tagged with footprint_type,
+            including their nodes
     """
-    # create dictionaries to hold vertices, footprints and relations
-    vertices = {}
+    # map each OSM node ID to a dense 0..n-1 index the first time it is seen,
+    # and accumulate the nodes' coordinates positionally in a plain list
+    node_id_to_idx = {}
+    node_coords = []
+
+    # create dictionaries to hold footprints and relations
     footprints = {}
     relations = {}
 
-    # create a set to hold the ids of ways not directly tagged as footprint_type
-    untagged_footprints = set()
+    # create a dictionary to hold the ways not directly tagged as footprint_type
+    untagged_ways = {}
 
     # loop through each response once adding each element to one of the dicts
     for response in responses:
         for element in response["elements"]:
+            # look up the element's id, type, and tags once rather than
+            # re-probing the element dict in every branch below
+            element_id = element["id"]
+            element_type = element.get("type")
+            tags = element.get("tags")
             # NODES - only keep coordinates
-            if "type" in element and element["type"] == "node":
-                vertices[element["id"]] = {"lat": element["lat"], "lon": element["lon"]}
+            if element_type == "node":
+                if element_id not in node_id_to_idx:
+                    node_id_to_idx[element_id] = len(node_coords)
+                    node_coords.append((element["lon"], element["lat"]))
             # WAYS - both open and closed
-            elif "type" in element and element["type"] == "way":
-                footprint = {"nodes": element["nodes"]}
-                if "tags" in element:
-                    for tag in element["tags"]:
-                        footprint[tag] = element["tags"][tag]
-                footprints[element["id"]] = footprint
-                # add ways not individually tagged with footprint_type to the
-                # untagged_footprints set
-                if ("tags" not in element) or (footprint_type not in element["tags"]):
-                    untagged_footprints.add(element["id"])
+            elif element_type == "way":
+                # ways not individually tagged with footprint_type only need
+                # their nodes, to build member geometries for relations
+                if tags is None or footprint_type not in tags:
+                    untagged_ways[element_id] = {"nodes": element["nodes"]}
+                    continue
+                footprint = {"nodes": element["nodes"], **tags}
+                footprints[element_id] = footprint
             # RELATIONS
-            elif "type" in element and element["type"] == "relation":
+            elif element_type == "relation":
+                # skip relations not individually tagged with footprint_type
+                if tags is None or footprint_type not in tags:
+                    continue
                 relation = {"members": {}}
                 for member in element["members"]:
-                    if "type" in member and member["type"] == "way":
+                    if member.get("type") == "way":
                         relation["members"].update({member["ref"]: member.get("role")})
-                if "tags" in element:
-                    for tag in element["tags"]:
-                        relation[tag] = element["tags"][tag]
-                relations[element["id"]] = relation
-                # add relations not individually tagged with footprint_type to
-                # the untagged_footprints set
-                if ("tags" not in element) or (footprint_type not in element["tags"]):
-                    untagged_footprints.add(element["id"])
+                relation.update(tags)
+                relations[element_id] = relation
             else:
-                utils.log(f'Element {element["id"]} is not a node, way or relation')
+                utils.log(f"Element {element_id} is not a node, way or relation")
 
-    return vertices, footprints, relations, untagged_footprints
+    return node_id_to_idx, node_coords, footprints, relations, untagged_ways
 
 
-def _create_footprint_geometry(footprint_key, footprint_val, vertices):
+def _create_footprint_geometry(footprint_key, footprint_val, node_id_to_idx, node_coords):
     """
     Create geometry for footprint open/closed ways.
 
@@ -231,27 +249,31 @@ def _create_footprint_geometry(footprint_key, footprint_val, vertices):
         the id of the way/footprint to process
     footprint_val : dict
         the nodes and tags of the footprint
-    vertices : dict
-        the dictionary of OSM nodes with their coordinates
+    node_id_to_idx : dict
+        map of OSM node IDs to their position in node_coords
+    node_coords : list
+        list of OSM nodes' (lng, lat) coordinate tuples
 
     Returns
     -------
-    Shapely Polygon or LineString
+    Shapely Polygon or LineString, or None if any of its nodes are missing
     """
+    try:
+        coords = [node_coords[node_id_to_idx[node]] for node in footprint_val["nodes"]]
+    except KeyError:
+        utils.log(f"Way {footprint_key} references nodes missing from the response")
+        return None
+
     # CLOSED WAYS
     if footprint_val["nodes"][0] == footprint_val["nodes"][-1]:
         try:
-            poly = [
-                (vertices[node]["lon"], vertices[node]["lat"]) for node in footprint_val["nodes"]
-            ]
-            footprint_geometry = Polygon(poly)
+            footprint_geometry = Polygon(coords)
         except Exception:
             utils.log(f"Polygon has invalid geometry: {footprint_key}")
     # OPEN WAYS
     else:
         try:
-            ls = [(vertices[node]["lon"], vertices[node]["lat"]) for node in footprint_val["nodes"]]
-            footprint_geometry = LineString(ls)
+            footprint_geometry = LineString(coords)
         except Exception:
             utils.log(f"LineString has invalid geometry: {footprint_key}")
 
@@ -283,8 +305,8 @@ def _create_relation_geometry(relation_key, relation_val, footprints):
         the id of the relation to process
     relation_val : dict
         members and tags of the relation
-    footprints : dict
-        dictionary of all footprints (including open and closed ways)
+    footprints : dict or collections.ChainMap
+        mapping of all ways (including open and closed, tagged and untagged)
 
     Returns
     -------
@@ -295,23 +317,9 @@ def _create_relation_geometry(relation_key, relation_val, footprints):
         relation_val, footprints
     )
 
-    # try to polygonize open outer ways and concatenate them to outer_polys
-    if len(outer_lines) > 0:
-        try:
-            result = list(polygonize(outer_lines))
-        except Exception:
-            utils.log(f"polygonize failed for outer ways in relation: {relation_key}")
-        else:
-            outer_polys += result
-
-    # try to polygonize open inner ways and concatenate them to inner_polys
-    if len(inner_lines) > 0:
-        try:
-            result = list(polygonize(inner_lines))
-        except Exception:
-            utils.log(f"polygonize failed for inner ways in relation: {relation_key}")
-        else:
-            inner_polys += result
+    # polygonize open outer and inner ways and add them to the closed ones
+    outer_polys.extend(_polygonize_lines(outer_lines, relation_key, "outer"))
+    inner_polys.extend(_polygonize_lines(inner_lines, relation_key, "inner"))
 
     # filter out relations missing both 'outer' and 'inner' polygons or just 'outer'
     multipoly = []
@@ -321,25 +329,185 @@ def _create_relation_geometry(relation_key, relation_val, footprints):
         utils.log(f"Relation {relation_key} missing outer closed ways")
     # process the others to multipolygons
     else:
-        for outer_poly in outer_polys:
-            outer_poly = outer_poly.buffer(0)  # fix invalid geometry if present
-            temp_poly = outer_poly
-            for inner_poly in inner_polys:
-                inner_poly = inner_poly.buffer(0)  # fix invalid geometry if present
-                if inner_poly.within(outer_poly):
-                    temp_poly = temp_poly.difference(inner_poly)
-            multipoly.append(temp_poly)
+        multipoly = _subtract_inner_polygons_from_outer_polygons(
+            relation_key, outer_polys, inner_polys
+        )
 
     # return relations with one outer way as Polygons, multiple outer ways
     # as MultiPolygons
     if len(multipoly) == 1:
         return multipoly[0]
     elif len(multipoly) > 1:
+        # flatten any MultiPolygon parts left by the hole subtraction so the
+        # MultiPolygon is built from Polygons in a single constructor call.
+        # usually every part is already a Polygon, so only rebuild the list
+        # if some part was split
+        if any(poly.geom_type == "MultiPolygon" for poly in multipoly):
+            polygons = []
+            for poly in multipoly:
+                if poly.geom_type == "MultiPolygon":
+                    polygons.extend(poly.geoms)
+                else:
+                    polygons.append(poly)
+            multipoly = polygons
         return MultiPolygon(multipoly)
     else:
         utils.log(f"relation {relation_key} could not be converted to a complex footprint")
 
 
+def _polygonize_lines(lines, relation_key, role):
+    """
+    Polygonize a relation's open member ways of one role.
+
+    Parameters
+    ----------
+    lines : list
+        list of the relation's open member ways' Shapely LineStrings
+    relation_key : int
+        the id of the relation to process
+    role : string
+        the members' role, 'outer' or 'inner', for logging
+
+    Returns
+    -------
+    list
+        list of Shapely Polygons, empty if polygonize fails
+    """
+    if len(lines) == 0:
+        return []
+
+    try:
+        return list(polygonize(lines))
+    except Exception:
+        utils.log(f"polygonize failed for {role} ways in relation: {relation_key}")
+        return []
+
+
+def _buffer_invalid_geometries(geometries):
+    """
+    Fix invalid geometries by buffering them by zero.
+
+    Validity checks are much cheaper than buffering, which rebuilds the whole
+    geometry, so only the geometries that fail the check are buffered. Valid
+    geometries are returned as is.
+
+    Parameters
+    ----------
+    geometries : list
+        list of Shapely geometries
+
+    Returns
+    -------
+    list
+    """
+    return [geometry if geometry.is_valid else geometry.buffer(0) for geometry in geometries]
+
+
+def _bounds_contain(outer_bounds, inner_bounds):
+    """
+    Check if one envelope contains another.
+
+    Parameters
+    ----------
+    outer_bounds : tuple
+        (minx, miny, maxx, maxy) of the containing geometry
+    inner_bounds : tuple
+        (minx, miny, maxx, maxy) of the contained geometry
+
+    Returns
+    -------
+    bool
+    """
+    return (
+        outer_bounds[0] <= inner_bounds[0]
+        and outer_bounds[1] <= inner_bounds[1]
+        and outer_bounds[2] >= inner_bounds[2]
+        and outer_bounds[3] >= inner_bounds[3]
+    )
+
+
+def _subtract_inner_polygons_from_outer_polygons(relation_key, outer_polys, inner_polys):
+    """
+    Subtract inner polygons (holes) from the outer polygons that contain them.
+
+    Where an outer polygon and the inner polygons it contains are all simple
+    rings, construct the polygon with holes directly from those rings, which
+    is much cheaper than an overlay operation. If that polygon is not valid
+    (e.g., because its holes overlap each other), fall back to subtracting
+    the union of the inner polygons from the outer polygon in one operation.
+
+    Parameters
+    ----------
+    relation_key : int
+        the id of the relation to process
+    outer_polys : list
+        list of the relation's outer Shapely Polygons
+    inner_polys : list
+        list of the relation's inner Shapely Polygons
+
+    Returns
+    -------
+    polygons : list
+        list of Shapely Polygons or MultiPolygons, one per outer polygon
+    """
+    # fix invalid geometries if present, once per polygon rather than once
+    # per outer/inner pair
+    outer_polys = _buffer_invalid_geometries(outer_polys)
+    inner_polys = _buffer_invalid_geometries(inner_polys)
+
+    # pair each outer polygon with the inner polygons it contains. rather than
+    # checking every outer/inner pair, build an r-tree of the inner polygons
+    # and query it once per outer polygon for the inner polygons whose
+    # envelopes intersect it. an inner polygon can only be within an outer
+    # polygon whose envelope contains its envelope, so compare the cached
+    # bounds first, then test the remaining candidates against the outer
+    # polygon, prepared once (with its edges indexed) for all of them
+    outer_holes = [[] for _ in outer_polys]
+    if len(inner_polys) > 0:
+        inner_bounds = {id(inner_poly): inner_poly.bounds for inner_poly in inner_polys}
+        inner_tree = STRtree(inner_polys)
+        for outer_poly, holes in zip(outer_polys, outer_holes):
+            outer_bounds = outer_poly.bounds
+            candidates = [
+                inner_poly
+                for inner_poly in inner_tree.query(outer_poly)
+                if _bounds_contain(outer_bounds, inner_bounds[id(inner_poly)])
+            ]
+            if len(candidates) > 0:
+                prepared_outer = prep(outer_poly)
+                holes.extend(filter(prepared_outer.contains, candidates))
+
+    polygons = []
+    for outer_poly, holes in zip(outer_polys, outer_holes):
+        if len(holes) == 0:
+            polygons.append(outer_poly)
+            continue
+
+        # try to build the polygon with holes directly from the rings
+        if outer_poly.geom_type == "Polygon" and all(
+            hole.geom_type == "Polygon" and len(hole.interiors) == 0 for hole in holes
+        ):
+            rings = list(outer_poly.interiors) + [hole.exterior for hole in holes]
+            polygon = Polygon(outer_poly.exterior, rings)
+            if polygon.is_valid:
+                polygons.append(polygon)
+                continue
+
+        # otherwise union the holes and subtract them all in one difference,
+        # rather than rebuilding the overlay once per hole. if GEOS hits a
+        # topology error, fix the outer polygon and the union of the holes
+        # with buffer(0), once each, and try again
+        holes_union = unary_union(holes)
+        try:
+            polygon = outer_poly.difference(holes_union)
+        except TopologicalError:
+            utils.log(f"Buffering geometries to subtract holes in relation: {relation_key}")
+            polygon = outer_poly.buffer(0).difference(holes_union.buffer(0))
+        polygons.append(polygon)
+
+    return polygons
+
+
 def _members_geom_lists(relation_val, footprints):
     """
     Add relation members' geoms to lists.
@@ -348,8 +516,8 @@ def _members_geom_lists(relation_val, footprints):
     ----------
     relation_val : dict
         members and tags of the relation
-    footprints : dict
-        dictionary of all footprints (including open and closed ways)
+    footprints : dict or collections.ChainMap
+        mapping of all ways (including open and closed, tagged and untagged)
 
     Returns
     -------
@@ -360,18 +528,27 @@ def _members_geom_lists(relation_val, footprints):
     inner_polys = []
     inner_lines = []
 
-    # add each members geometry to a list according to its role and geometry type
+    # map each (role, geometry type) pair to the list its members belong in
+    geom_lists = {
+        ("outer", "Polygon"): outer_polys,
+        ("outer", "LineString"): outer_lines,
+        ("inner", "Polygon"): inner_polys,
+        ("inner", "LineString"): inner_lines,
+    }
+
+    # add each members geometry to a list according to its role and geometry
+    # type, looking up the member's geometry and its type only once. skip
+    # degenerate (empty or zero-length) lines, which cannot form any ring
     for member_id, member_role in relation_val["members"].items():
-        if member_role == "outer":
-            if footprints[member_id]["geometry"].geom_type == "Polygon":
-                outer_polys.append(footprints[member_id]["geometry"])
-            elif footprints[member_id]["geometry"].geom_type == "LineString":
-                outer_lines.append(footprints[member_id]["geometry"])
-        elif member_role == "inner":
-            if footprints[member_id]["geometry"].geom_type == "Polygon":
-                inner_polys.append(footprints[member_id]["geometry"])
-            elif footprints[member_id]["geometry"].geom_type == "LineString":
-                inner_lines.append(footprints[member_id]["geometry"])
+        if member_role in {"outer", "inner"}:
+            geometry = footprints[member_id]["geometry"]
+            if geometry is not None:
+                geom_type = geometry.geom_type
+                if geom_type == "LineString" and (geometry.is_empty or geometry.length == 0):
+                    continue
+                geom_list = geom_lists.get((member_role, geom_type))
+                if geom_list is not None:
+                    geom_list.append(geometry)
 
     return outer_polys, outer_lines, inner_polys, inner_lines
 
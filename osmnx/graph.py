@@ -6,8 +6,6 @@ import xml.sax
 from itertools import groupby
 
 import networkx as nx
-from shapely.geometry import MultiPolygon
-from shapely.geometry import Polygon
 
 from . import distance
 from . import downloader
@@ -404,10 +402,11 @@ def graph_from_polygon(
     other custom settings via ox.config().
     """
     # verify that the geometry is valid and is a shapely Polygon/MultiPolygon
-    # before proceeding
-    if not polygon.is_valid:
+    # before proceeding. bounding box polygons are trivially valid, so skip
+    # the full validity check for them
+    if not utils_geo._is_bbox_poly(polygon) and not polygon.is_valid:
         raise ValueError("The geometry to query within is invalid")
-    if not isinstance(polygon, (Polygon, MultiPolygon)):
+    if polygon.geom_type not in {"Polygon", "MultiPolygon"}:
         raise TypeError(
             "Geometry must be a shapely Polygon or MultiPolygon. If you requested "
             "graph from place name, make sure your query resolves to a Polygon or "
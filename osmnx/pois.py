@@ -1,6 +1,7 @@
 """Download points of interests (POIs) from OpenStreetMap."""
 
 import geopandas as gpd
+import numpy as np
 from shapely.geometry import MultiPolygon
 from shapely.geometry import Point
 from shapely.geometry import Polygon
@@ -164,8 +165,7 @@ def _parse_polygonal_poi(coords, response):
             poi = {"nodes": nodes, "geometry": polygon, "osmid": response["id"]}
 
             if "tags" in response:
-                for tag in response["tags"]:
-                    poi[tag] = response["tags"][tag]
+                poi.update(response["tags"])
             return poi
 
         except Exception:
@@ -192,8 +192,7 @@ def _parse_osm_node(response):
         poi = {"osmid": response["id"], "geometry": point}
 
         if "tags" in response:
-            for tag in response["tags"]:
-                poi[tag] = response["tags"][tag]
+            poi.update(response["tags"])
 
     except Exception:
         utils.log(f'Point has invalid geometry: {response["id"]}')
@@ -276,18 +275,20 @@ def _parse_osm_relations(relations, df_osm_ways):
 
                 if multipoly:
                     # Create GeoDataFrame with the tags and the MultiPolygon and its
-                    # 'ways' (ids), and the 'nodes' of those ways
-                    geo = gpd.GeoDataFrame(relation["tags"], index=[relation["id"]])
-                    # Initialize columns (needed for .loc inserts)
-                    geo = geo.assign(
-                        geometry=None, ways=None, nodes=None, element_type=None, osmid=None
+                    # 'ways' (ids), and the 'nodes' of those ways in one constructor
+                    # call, rather than inserting each attribute with its own .loc
+                    attrs = {
+                        "geometry": [multipoly],
+                        "ways": [member_way_ids],
+                        "nodes": [member_nodes],
+                        "element_type": "relation",
+                        "osmid": relation["id"],
+                    }
+                    geo = gpd.GeoDataFrame(
+                        {**relation["tags"], **attrs},
+                        index=[relation["id"]],
+                        crs=settings.default_crs,
                     )
-                    # Add attributes
-                    geo.loc[relation["id"], "geometry"] = multipoly
-                    geo.loc[relation["id"], "ways"] = member_way_ids
-                    geo.loc[relation["id"], "nodes"] = member_nodes
-                    geo.loc[relation["id"], "element_type"] = "relation"
-                    geo.loc[relation["id"], "osmid"] = relation["id"]
 
                     # Append to relation GeoDataFrame
                     gdf_relations = gdf_relations.append(geo, sort=False)
@@ -301,7 +302,29 @@ def _parse_osm_relations(relations, df_osm_ways):
     return df_osm_ways
 
 
-def _create_poi_gdf(polygon, tags):
+def _records_to_gdf(records, osmids):
+    """
+    Create a GeoDataFrame from a list of POI records.
+
+    Parameters
+    ----------
+    records : list
+        list of dicts of POIs' attributes, each including a geometry
+    osmids : list
+        list of the POIs' OSM IDs, used as the GeoDataFrame's index
+
+    Returns
+    -------
+    gdf : geopandas.GeoDataFrame
+    """
+    # pass the geometries in as their own list and build the GeoDataFrame in
+    # one call, rather than building it column-wise and transposing it
+    geometry = [record.pop("geometry") for record in records]
+    gdf = gpd.GeoDataFrame(records, index=osmids, geometry=geometry, crs=settings.default_crs)
+    return gdf
+
+
+def _create_poi_gdf(polygon, tags, responses=None):
     """
     Create GeoDataFrame from POIs json returned by Overpass API.
 
@@ -311,68 +334,87 @@ def _create_poi_gdf(polygon, tags):
         geographic boundaries to fetch POIs within
     tags : dict
         dict of tags used for finding POIs from the selected area
+    responses : dict
+        pre-existing response json. if None, download it from the API
 
     Returns
     -------
     gdf : geopandas.GeoDataFrame
         POIs and their associated tags
     """
-    responses = _osm_poi_download(polygon, tags)
+    if responses is None:
+        responses = _osm_poi_download(polygon, tags)
 
     # Parse coordinates from all the nodes in the response
     coords = _parse_nodes_coords(responses)
 
-    # POI nodes
-    poi_nodes = {}
+    # POI nodes, as a list of records and a list of their OSM IDs
+    poi_nodes = []
+    poi_node_ids = []
 
-    # POI ways
-    poi_ways = {}
+    # POI ways, as a list of records and a list of their OSM IDs
+    poi_ways = []
+    poi_way_ids = []
 
     # A list of POI relations
     relations = []
 
     for result in responses["elements"]:
-        if result["type"] == "node" and "tags" in result:
+        result_type = result["type"]
+        if result_type == "node" and "tags" in result:
             poi = _parse_osm_node(response=result)
             # Add element_type
             poi["element_type"] = "node"
-            # Add to 'pois'
-            poi_nodes[result["id"]] = poi
-        elif result["type"] == "way":
+            # Add to 'poi_nodes'
+            poi_nodes.append(poi)
+            poi_node_ids.append(result["id"])
+        elif result_type == "way":
             # Parse POI area Polygon
             poi_area = _parse_polygonal_poi(coords=coords, response=result)
             if poi_area:
                 # Add element_type
                 poi_area["element_type"] = "way"
                 # Add to 'poi_ways'
-                poi_ways[result["id"]] = poi_area
+                poi_ways.append(poi_area)
+                poi_way_ids.append(result["id"])
 
-        elif result["type"] == "relation":
+        elif result_type == "relation":
             # Add relation to a relation list (needs to be parsed after
             # all nodes and ways have been parsed)
             relations.append(result)
 
     # Create GeoDataFrames
-    gdf_nodes = gpd.GeoDataFrame(poi_nodes).T
-    gdf_nodes.crs = settings.default_crs
-
-    gdf_ways = gpd.GeoDataFrame(poi_ways).T
-    gdf_ways.crs = settings.default_crs
+    gdf_nodes = _records_to_gdf(poi_nodes, poi_node_ids)
+    gdf_ways = _records_to_gdf(poi_ways, poi_way_ids)
 
     # Parse relations (MultiPolygons) from 'ways'
     gdf_ways = _parse_osm_relations(relations=relations, df_osm_ways=gdf_ways)
 
-    # Combine GeoDataFrames
-    gdf = gdf_nodes.append(gdf_ways, sort=False)
+    # Combine GeoDataFrames, skipping an empty one: appending a frame with no
+    # rows (and so none of the other's columns) would upcast the other's
+    # columns, e.g. its integer osmids to floats
+    if len(gdf_ways) == 0:
+        gdf = gdf_nodes
+    elif len(gdf_nodes) == 0:
+        gdf = gdf_ways
+    else:
+        gdf = gdf_nodes.append(gdf_ways, sort=False)
 
     # if caller requested pois within a polygon, only retain those that fall
     # within the polygon
     if len(gdf) > 0:
-        gdf_proj = projection.project_gdf(gdf)
-        poly_proj, crs = projection.project_geometry(polygon)
-        to_keep = gdf_proj.centroid.within(poly_proj)
-        gdf_proj = gdf_proj.loc[to_keep]
-        gdf = projection.project_gdf(gdf_proj, to_latlong=True)
+        # use the spatial index to find the POIs whose bounds intersect the
+        # polygon's bounds, then project only these candidates' geometries to
+        # precisely check whether their centroids lie within the polygon, and
+        # select the POIs to keep from the gdf in a single pass
+        possible_matches_iloc = sorted(gdf.sindex.intersection(polygon.bounds))
+        to_keep = []
+        if len(possible_matches_iloc) > 0:
+            poly_proj, crs_proj = projection.project_geometry(polygon)
+            possible_matches = gdf["geometry"].iloc[possible_matches_iloc].to_crs(crs_proj)
+            is_within = possible_matches.centroid.within(poly_proj).values
+            to_keep = np.array(possible_matches_iloc)[is_within]
+        gdf = gdf.iloc[to_keep]
 
     return gdf
 
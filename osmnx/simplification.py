@@ -307,7 +307,7 @@ def simplify_graph(G, strict=True, remove_rings=True):
         wccs = nx.weakly_connected_components(G)
         nodes_in_rings = set()
         for wcc in wccs:
-            if all([not _is_endpoint(G, n) for n in wcc]):
+            if not any(_is_endpoint(G, n) for n in wcc):
                 nodes_in_rings.update(wcc)
         G.remove_nodes_from(nodes_in_rings)
 
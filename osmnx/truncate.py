@@ -154,8 +154,7 @@ def truncate_graph_polygon(
     # identify all the nodes that lie outside the polygon
     gs_nodes = utils_graph.graph_to_gdfs(G, edges=False)[["geometry"]]
     to_keep = utils_geo._intersect_index_quadrats(gs_nodes, polygon, quadrat_width, min_num)
-    gs_nodes_outside_geom = gs_nodes[~gs_nodes.index.isin(to_keep)]
-    nodes_outside_geom = set(gs_nodes_outside_geom.index)
+    nodes_outside_geom = set(gs_nodes.index) - to_keep
 
     if truncate_by_edge:
         nodes_to_remove = set()
@@ -363,8 +363,14 @@ def _intersect_index_quadrats(points, geometry, quadrat_width=0.05, min_num=3):
     points_in_geom : set
         index labels of points that intersected geometry
     """
-    # cut the geometry into chunks for r-tree spatial index intersecting
-    multipoly = _quadrat_cut_geometry(geometry, quadrat_width=quadrat_width, min_num=min_num)
+    # cut the geometry into chunks for r-tree spatial index intersecting. if
+    # the geometry fits within a single quadrat, cutting it up would not make
+    # the r-tree search any more selective, so just use the whole geometry
+    west, south, east, north = geometry.bounds
+    if max(east - west, north - south) <= quadrat_width:
+        multipoly = [geometry]
+    else:
+        multipoly = _quadrat_cut_geometry(geometry, quadrat_width=quadrat_width, min_num=min_num)
 
     # create an r-tree spatial index for the nodes (ie, points)
     sindex = points.sindex
@@ -459,3 +465,35 @@ def bbox_to_poly(north, south, east, west):
     shapely.geometry.Polygon
     """
     return Polygon([(west, south), (east, south), (east, north), (west, north)])
+
+
+def _is_bbox_poly(geometry):
+    """
+    Determine if a geometry is an axis-aligned rectangle, like a bounding box.
+
+    Such a polygon is trivially valid, so callers can skip the full GEOS
+    validity check for it. This only compares its handful of coordinates.
+
+    Parameters
+    ----------
+    geometry : shapely.geometry.BaseGeometry
+        the geometry to check
+
+    Returns
+    -------
+    bool
+    """
+    if geometry.geom_type != "Polygon" or len(geometry.interiors) > 0:
+        return False
+
+    coords = list(geometry.exterior.coords)
+    if len(coords) != 5:
+        return False
+
+    # every edge must be horizontal or vertical, the ring must span two
+    # distinct x values and two distinct y values, and it must visit four
+    # distinct corners (otherwise it doubles back on itself with zero area)
+    xs = {x for x, _ in coords}
+    ys = {y for _, y in coords}
+    axis_aligned = all(x1 == x2 or y1 == y2 for (x1, y1), (x2, y2) in zip(coords[:-1], coords[1:]))
+    return axis_aligned and len(xs) == 2 and len(ys) == 2 and len(set(coords[:-1])) == 4
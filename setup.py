@@ -76,6 +76,7 @@ setup(
     install_requires=INSTALL_REQUIRES,
     extras_require={
         "folium": ["folium>=0.11"],
+        "orjson": ["orjson>=3.0"],
         "kdtree": ["scipy>=1.4"],
         "balltree": ["scikit-learn>=0.23"],
     },
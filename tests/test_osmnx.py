@@ -105,6 +105,22 @@ def test_geometry_coords_rounding():
     shape2 = ox.utils_geo.round_geometry_coords(shape1, precision)
 
 
+def test_bbox_poly():
+    # test identifying bounding box polygons, which skip the validity check
+    bbox_poly = ox.utils_geo.bbox_to_poly(37.79, 37.78, -122.41, -122.42)
+    assert ox.utils_geo._is_bbox_poly(bbox_poly)
+    assert ox.utils_geo._is_bbox_poly(polygon)
+
+    # a self-intersecting "bowtie" with 4 vertices is not a bounding box
+    bowtie = Polygon([(0, 0), (1, 1), (0, 1), (1, 0)])
+    assert not ox.utils_geo._is_bbox_poly(bowtie)
+
+    # degenerate rings that double back on themselves have zero area
+    assert not ox.utils_geo._is_bbox_poly(Polygon([(0, 0), (1, 0), (1, 1), (1, 0)]))
+    assert not ox.utils_geo._is_bbox_poly(Polygon([(0, 0), (1, 0), (0, 0), (0, 1)]))
+    assert not ox.utils_geo._is_bbox_poly(Point(0, 0))
+
+
 def test_geocode_to_gdf():
     # test loading spatial boundaries and plotting
     city = ox.geocode_to_gdf(place1, which_result=1, buffer_dist=100)
@@ -252,6 +268,50 @@ def test_pois():
     gdf = ox.pois_from_place(place1, tags=tags)
     gdf = ox.pois_from_address(address, tags={"amenity": "school"})
 
+    # a response with a multipolygon relation of two closed ways, plus a
+    # tagged node outside the query polygon, should produce a single relation
+    # POI in the default crs
+    elements = [
+        {"type": "node", "id": 1, "lat": 0, "lon": 0},
+        {"type": "node", "id": 2, "lat": 0, "lon": 0.001},
+        {"type": "node", "id": 3, "lat": 0.001, "lon": 0.001},
+        {"type": "node", "id": 4, "lat": 0.001, "lon": 0},
+        {"type": "node", "id": 5, "lat": 0.002, "lon": 0.002},
+        {"type": "node", "id": 6, "lat": 0.002, "lon": 0.003},
+        {"type": "node", "id": 7, "lat": 0.003, "lon": 0.003},
+        {"type": "node", "id": 8, "lat": 0.003, "lon": 0.002},
+        {"type": "node", "id": 9, "lat": 0.02, "lon": 0.02, "tags": {"amenity": "parking"}},
+        {"type": "way", "id": 10, "nodes": [1, 2, 3, 4, 1]},
+        {"type": "way", "id": 11, "nodes": [5, 6, 7, 8, 5]},
+        {
+            "type": "relation",
+            "id": 20,
+            "members": [
+                {"type": "way", "ref": 10, "role": "outer"},
+                {"type": "way", "ref": 11, "role": "outer"},
+            ],
+            "tags": {"type": "multipolygon", "amenity": "parking"},
+        },
+    ]
+    bbox = ox.utils_geo.bbox_to_poly(0.01, -0.01, 0.01, -0.01)
+    gdf = ox.pois._create_poi_gdf(bbox, {"amenity": "parking"}, responses={"elements": elements})
+    assert list(gdf.index) == [20]
+    assert 9 not in gdf.index
+    assert gdf.loc[20, "element_type"] == "relation"
+    assert gdf.loc[20, "geometry"].type == "MultiPolygon"
+    assert gdf.crs == ox.settings.default_crs
+    assert pd.api.types.is_integer_dtype(gdf["osmid"].dtype)
+
+    # a response with only node POIs should keep their osmids as integers,
+    # without losing precision on ids above 2**53
+    elements = [
+        {"type": "node", "id": 2 ** 53 + 1, "lat": 0, "lon": 0, "tags": {"amenity": "bench"}},
+        {"type": "node", "id": 2, "lat": 0.001, "lon": 0, "tags": {"amenity": "bench"}},
+    ]
+    gdf = ox.pois._create_poi_gdf(bbox, {"amenity": "bench"}, responses={"elements": elements})
+    assert pd.api.types.is_integer_dtype(gdf["osmid"].dtype)
+    assert list(gdf["osmid"]) == [2 ** 53 + 1, 2]
+
 
 def test_api_endpoints():
 
@@ -445,6 +505,115 @@ def test_footprints():
         mis_tagged_bus_route_responses = [json.load(read_file)]
     ox.footprints._create_footprints_gdf(responses=mis_tagged_bus_route_responses)
 
+    # way 11 references node 99, which is missing from the response, so it
+    # gets no geometry, both on its own and as an outer member of relation 20.
+    # relation 20's other outer member, way 12, is not tagged as a building
+    missing_node_elements = [
+        {"type": "node", "id": 1, "lat": 0, "lon": 0},
+        {"type": "node", "id": 2, "lat": 0, "lon": 1},
+        {"type": "node", "id": 3, "lat": 1, "lon": 1},
+        {"type": "node", "id": 4, "lat": 1, "lon": 0},
+        {"type": "node", "id": 5, "lat": 2, "lon": 2},
+        {"type": "node", "id": 6, "lat": 2, "lon": 3},
+        {"type": "node", "id": 7, "lat": 3, "lon": 3},
+        {"type": "node", "id": 8, "lat": 3, "lon": 2},
+        {"type": "way", "id": 10, "nodes": [1, 2, 3, 4, 1], "tags": {"building": "yes"}},
+        {"type": "way", "id": 11, "nodes": [1, 2, 99, 1], "tags": {"building": "yes"}},
+        {"type": "way", "id": 12, "nodes": [5, 6, 7, 8, 5]},
+        {
+            "type": "relation",
+            "id": 20,
+            "members": [
+                {"type": "way", "ref": 11, "role": "outer"},
+                {"type": "way", "ref": 12, "role": "outer"},
+            ],
+            "tags": {"type": "multipolygon", "building": "yes"},
+        },
+    ]
+    missing_node_gdf = ox.footprints._create_footprints_gdf(
+        responses=[{"elements": missing_node_elements}]
+    )
+    assert set(missing_node_gdf.index) == {10, 20}
+    assert missing_node_gdf.loc[20, "geometry"].equals(Polygon([(2, 2), (3, 2), (3, 3), (2, 3)]))
+
+    # relation 40 has one outer ring and two overlapping inner rings. a polygon
+    # built directly from these rings is invalid, so the holes are subtracted
+    # from the outer ring as their union instead
+    overlapping_inner_elements = [
+        {"type": "node", "id": 1, "lat": 0, "lon": 0},
+        {"type": "node", "id": 2, "lat": 0, "lon": 10},
+        {"type": "node", "id": 3, "lat": 10, "lon": 10},
+        {"type": "node", "id": 4, "lat": 10, "lon": 0},
+        {"type": "node", "id": 5, "lat": 1, "lon": 1},
+        {"type": "node", "id": 6, "lat": 1, "lon": 5},
+        {"type": "node", "id": 7, "lat": 5, "lon": 5},
+        {"type": "node", "id": 8, "lat": 5, "lon": 1},
+        {"type": "node", "id": 9, "lat": 4, "lon": 4},
+        {"type": "node", "id": 10, "lat": 4, "lon": 8},
+        {"type": "node", "id": 11, "lat": 8, "lon": 8},
+        {"type": "node", "id": 12, "lat": 8, "lon": 4},
+        {"type": "way", "id": 30, "nodes": [1, 2, 3, 4, 1]},
+        {"type": "way", "id": 31, "nodes": [5, 6, 7, 8, 5]},
+        {"type": "way", "id": 32, "nodes": [9, 10, 11, 12, 9]},
+        {
+            "type": "relation",
+            "id": 40,
+            "members": [
+                {"type": "way", "ref": 30, "role": "outer"},
+                {"type": "way", "ref": 31, "role": "inner"},
+                {"type": "way", "ref": 32, "role": "inner"},
+            ],
+            "tags": {"type": "multipolygon", "building": "yes"},
+        },
+    ]
+    overlapping_inner_gdf = ox.footprints._create_footprints_gdf(
+        responses=[{"elements": overlapping_inner_elements}]
+    )
+    outer = Polygon([(0, 0), (10, 0), (10, 10), (0, 10)])
+    holes = Polygon([(1, 1), (5, 1), (5, 5), (1, 5)]).union(
+        Polygon([(4, 4), (8, 4), (8, 8), (4, 8)])
+    )
+    geometry = overlapping_inner_gdf.loc[40, "geometry"]
+    assert geometry.type == "Polygon"
+    assert geometry.area == 100 - 16 - 16 + 1
+    assert geometry.equals(outer.difference(holes))
+
+    # relation 60 has two outer rings, and an inner strip that splits the
+    # first of them in two, so its footprint is a MultiPolygon of 3 parts
+    split_outer_elements = [
+        {"type": "node", "id": 1, "lat": 0, "lon": 0},
+        {"type": "node", "id": 2, "lat": 0, "lon": 10},
+        {"type": "node", "id": 3, "lat": 10, "lon": 10},
+        {"type": "node", "id": 4, "lat": 10, "lon": 0},
+        {"type": "node", "id": 5, "lat": 0, "lon": 4},
+        {"type": "node", "id": 6, "lat": 0, "lon": 6},
+        {"type": "node", "id": 7, "lat": 10, "lon": 6},
+        {"type": "node", "id": 8, "lat": 10, "lon": 4},
+        {"type": "node", "id": 9, "lat": 0, "lon": 20},
+        {"type": "node", "id": 10, "lat": 0, "lon": 30},
+        {"type": "node", "id": 11, "lat": 10, "lon": 30},
+        {"type": "node", "id": 12, "lat": 10, "lon": 20},
+        {"type": "way", "id": 50, "nodes": [1, 2, 3, 4, 1]},
+        {"type": "way", "id": 51, "nodes": [5, 6, 7, 8, 5]},
+        {"type": "way", "id": 52, "nodes": [9, 10, 11, 12, 9]},
+        {
+            "type": "relation",
+            "id": 60,
+            "members": [
+                {"type": "way", "ref": 50, "role": "outer"},
+                {"type": "way", "ref": 51, "role": "inner"},
+                {"type": "way", "ref": 52, "role": "outer"},
+            ],
+            "tags": {"type": "multipolygon", "building": "yes"},
+        },
+    ]
+    split_outer_gdf = ox.footprints._create_footprints_gdf(
+        responses=[{"elements": split_outer_elements}]
+    )
+    geometry = split_outer_gdf.loc[60, "geometry"]
+    assert geometry.type == "MultiPolygon"
+    assert len(geometry.geoms) == 3
+
     # test plotting multipolygon
     fig, ax = ox.plot_footprints(clapham_common_gdf)
 